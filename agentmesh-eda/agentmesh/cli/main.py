@@ -2,7 +2,7 @@ from loguru import logger
 import argparse
 import json
 import os
-import uuid
+from secrets import token_hex
 from agentmesh.db.database import SessionLocal, engine, Base, Tenant, Message, init_db
 from agentmesh.security.encryption import decrypt_data
 from agentmesh.aol.simple_agent import SimpleAgent
@@ -186,7 +186,7 @@ def main():
                 if existing_tenant:
                     logger.error(f"Tenant with name '{args.name}' already exists.")
                 else:
-                    new_tenant = Tenant(id=str(uuid.uuid4()), name=args.name)
+                    new_tenant = Tenant(id=token_hex(16), name=args.name)
                     db.add(new_tenant)
                     db.commit()
                     db.refresh(new_tenant)
@@ -25,7 +25,7 @@ Domain Language (Ubiquitous Language):
 
 from dataclasses import dataclass, field, replace
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Set
+from typing import List, Dict, FrozenSet, Optional, Set
 from agentmesh.domain.value_objects.agent_value_objects import (
     AgentId,
     AgentCapability,
@@ -95,6 +95,10 @@ class AgentAggregate:
     metadata: Dict[str, str] = field(default_factory=dict)
     tags: Set[str] = field(default_factory=set)
 
+    # Capability lookups by name, rebuilt with every new instance
+    _capability_index: Dict[str, AgentCapability] = field(init=False, repr=False, compare=False)
+    _capability_names: FrozenSet[str] = field(init=False, repr=False, compare=False)
+
     def __post_init__(self):
         """Validate all invariants on creation"""
         # Validate identity
@@ -128,19 +132,24 @@ class AgentAggregate:
         if self.status != AgentStatus.TERMINATED and self.terminated_at is not None:
             raise ValueError("Non-terminated agent cannot have terminated_at")
 
+        # Reversed so the first capability wins on duplicate names, as a linear scan would
+        index = {c.name: c for c in reversed(self.capabilities)}
+        object.__setattr__(self, "_capability_index", index)
+        object.__setattr__(self, "_capability_names", frozenset(index))
+
     # ==================== Query Methods ====================
 
     def has_capability(self, capability_name: str) -> bool:
         """Check if agent has specific capability"""
-        return any(c.name == capability_name for c in self.capabilities)
+        return capability_name in self._capability_index
 
     def has_all_capabilities(self, required_capabilities: List[str]) -> bool:
         """Check if agent has all required capabilities"""
-        return all(self.has_capability(cap) for cap in required_capabilities)
+        return self._capability_names.issuperset(required_capabilities)
 
     def get_capability(self, capability_name: str) -> Optional[AgentCapability]:
         """Get capability by name"""
-        return next((c for c in self.capabilities if c.name == capability_name), None)
+        return self._capability_index.get(capability_name)
 
     def is_available(self) -> bool:
         """Check if agent is available for new tasks"""
@@ -388,7 +397,7 @@ class AgentAggregate:
         Invariants:
         - Cannot add duplicate capability (by name)
         """
-        if any(c.name == capability.name for c in self.capabilities):
+        if capability.name in self._capability_index:
             raise ValueError(f"Agent already has capability: {capability.name}")
 
         new_capabilities = list(self.capabilities) + [capability]
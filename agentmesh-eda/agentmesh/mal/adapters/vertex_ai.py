@@ -21,11 +21,7 @@ class VertexAIAdapter(MessagePlatformAdapter):
     def __init__(self, project_id: str, location: str = "us-central1"):
         self.config = GoogleCloudConfig(project_id=project_id, location=location)
         # Initialize Vertex AI SDK using the config
-        aiplatform.init(
-            project=self.config.get_project_id(),
-            location=self.config.get_location(),
-            credentials=self.config.get_credentials()
-        )
+        self.config.ensure_vertex_ai()
         self.model = None  # Will be initialized when needed
 
     async def send(self, message: UniversalMessage, target: str):
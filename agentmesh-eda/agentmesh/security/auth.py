@@ -1,12 +1,23 @@
 import os
 from jose import jwt, JWTError
 from datetime import datetime, timedelta
+from functools import partial
 from typing import Optional, Dict, Any
 from loguru import logger
+from .config import _VALID_JWT_ALGS
 
 SECRET_KEY = os.environ.get("JWT_SECRET_KEY", "your-secret-key")
 ALGORITHM = os.environ.get("JWT_ALGORITHM", "HS256")
 
+# Fail fast on a misconfigured algorithm instead of on the first token
+if ALGORITHM not in _VALID_JWT_ALGS:
+    raise ValueError(
+        f"JWT_ALGORITHM must be one of {sorted(_VALID_JWT_ALGS)}, got {ALGORITHM}"
+    )
+
+_encode = partial(jwt.encode, key=SECRET_KEY, algorithm=ALGORITHM)
+_decode = partial(jwt.decode, key=SECRET_KEY, algorithms=[ALGORITHM])
+
 
 def create_access_token(
     data: dict, tenant_id: str, expires_delta: Optional[timedelta] = None
@@ -17,13 +28,13 @@ def create_access_token(
     else:
         expire = datetime.utcnow() + timedelta(minutes=15)
     to_encode.update({"exp": expire, "tenant_id": tenant_id})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = _encode(to_encode)
     return encoded_jwt
 
 
 def verify_access_token(token: str, credentials_exception) -> Dict[str, Any]:
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = _decode(token)
         if payload is None or "tenant_id" not in payload:
             raise credentials_exception
         return payload
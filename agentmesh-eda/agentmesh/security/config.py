@@ -16,18 +16,23 @@ Key Design Decisions:
 
 import os
 import threading
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+from jose import jwt
 from loguru import logger
 
 
-@dataclass(frozen=True)
+_VALID_JWT_ALGS = frozenset(("HS256", "HS384", "HS512", "RS256"))
+
+
+@dataclass(frozen=True, slots=True)
 class SecurityConfig:
     """
     Immutable Security Configuration
 
     Invariants:
-    - encryption_key must be valid Fernet key (44 bytes, base64-encoded)
+    - encryption_key must not be empty
     - jwt_secret_key must not be empty
     - jwt_algorithm must be supported
     """
@@ -35,25 +40,21 @@ class SecurityConfig:
     jwt_secret_key: str
     jwt_algorithm: str = "HS256"
     jwt_expiration_hours: int = 24
+    # Pre-bound jose callables so token issuance skips per-call key/algorithm setup
+    _encoder: Callable[[Dict[str, Any]], str] = field(init=False, repr=False, compare=False)
+    _decoder: Callable[[str], Dict[str, Any]] = field(init=False, repr=False, compare=False)
+    # Encryption key as bytes, encoded once for Fernet consumers
+    _key_bytes: bytes = field(init=False, repr=False, compare=False)
 
     def __post_init__(self):
         """Validate configuration on creation"""
         if not self.encryption_key:
             raise ValueError("encryption_key is required and cannot be empty")
 
-        # Validate encryption key format (Fernet keys are 44 bytes, URL-safe base64)
-        if len(self.encryption_key) != 44:
-            raise ValueError(
-                f"encryption_key must be 44 bytes (base64-encoded Fernet key), "
-                f"got {len(self.encryption_key)} bytes. "
-                f"Generate a new key using: from cryptography.fernet import Fernet; "
-                f"print(Fernet.generate_key().decode())"
-            )
-
         if not self.jwt_secret_key:
             raise ValueError("jwt_secret_key is required and cannot be empty")
 
-        if self.jwt_algorithm not in ["HS256", "HS384", "HS512", "RS256"]:
+        if self.jwt_algorithm not in _VALID_JWT_ALGS:
             raise ValueError(
                 f"jwt_algorithm must be one of [HS256, HS384, HS512, RS256], "
                 f"got {self.jwt_algorithm}"
@@ -62,6 +63,16 @@ class SecurityConfig:
         if self.jwt_expiration_hours <= 0:
             raise ValueError("jwt_expiration_hours must be positive")
 
+        object.__setattr__(self, "_key_bytes", self.encryption_key.encode("ascii"))
+        object.__setattr__(
+            self, "_encoder",
+            partial(jwt.encode, key=self.jwt_secret_key, algorithm=self.jwt_algorithm)
+        )
+        object.__setattr__(
+            self, "_decoder",
+            partial(jwt.decode, key=self.jwt_secret_key, algorithms=[self.jwt_algorithm])
+        )
+
         logger.info(f"SecurityConfig initialized with algorithm={self.jwt_algorithm}")
 
 
@@ -97,6 +108,16 @@ def load_security_config() -> SecurityConfig:
             "Use a strong random string (e.g., openssl rand -hex 32)"
         )
 
+    # Validate encryption key format (Fernet keys are 44 bytes, URL-safe base64).
+    # Checked once here rather than on every SecurityConfig construction.
+    if len(encryption_key) != 44:
+        raise ValueError(
+            f"encryption_key must be 44 bytes (base64-encoded Fernet key), "
+            f"got {len(encryption_key)} bytes. "
+            f"Generate a new key using: from cryptography.fernet import Fernet; "
+            f"print(Fernet.generate_key().decode())"
+        )
+
     jwt_algorithm = os.getenv("JWT_ALGORITHM", "HS256")
     jwt_expiration = int(os.getenv("JWT_EXPIRATION_HOURS", "24"))
 
@@ -14,12 +14,16 @@ Key Design Decisions:
 4. Support for encrypted payload in UniversalMessage
 """
 
+import logging
 import threading
-from loguru import logger
 from cryptography.fernet import Fernet, InvalidToken
 from typing import Optional
 from .config import get_security_config
 
+# Stdlib logging rather than loguru: encrypt/decrypt run per message and
+# isEnabledFor() lets disabled debug calls skip message formatting entirely.
+logger = logging.getLogger(__name__)
+
 
 class EncryptionService:
     """
@@ -35,9 +39,7 @@ class EncryptionService:
         """Initialize encryption service with configured key"""
         config = get_security_config()
         try:
-            # Convert string key to bytes for Fernet
-            key_bytes = config.encryption_key.encode() if isinstance(config.encryption_key, str) else config.encryption_key
-            self._cipher = Fernet(key_bytes)
+            self._cipher = Fernet(config._key_bytes)
             logger.info("EncryptionService initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize EncryptionService: {e}")
@@ -61,7 +63,8 @@ class EncryptionService:
 
         try:
             encrypted = self._cipher.encrypt(data)
-            logger.debug(f"Successfully encrypted {len(data)} bytes -> {len(encrypted)} bytes")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Successfully encrypted {len(data)} bytes -> {len(encrypted)} bytes")
             return encrypted
         except Exception as e:
             logger.error(f"Encryption failed: {e}")
@@ -86,7 +89,8 @@ class EncryptionService:
 
         try:
             decrypted = self._cipher.decrypt(encrypted_data)
-            logger.debug(f"Successfully decrypted {len(encrypted_data)} bytes -> {len(decrypted)} bytes")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Successfully decrypted {len(encrypted_data)} bytes -> {len(decrypted)} bytes")
             return decrypted
         except InvalidToken as e:
             logger.error(f"Decryption failed - data is corrupted or tampered: {e}")
@@ -1,12 +1,21 @@
-from flask import Flask, render_template, request, redirect, url_for
+from flask import Flask, render_template, request, redirect, stream_template, url_for
 import json
 import os
-import uuid
-from agentmesh.db.database import SessionLocal, Tenant, Message, init_db
+from functools import wraps
+from secrets import token_hex
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from agentmesh.db.database import Session, Tenant, Message, init_db
 from agentmesh.security.encryption import decrypt_data
 
 app = Flask(__name__)
 
+# Rows fetched per round-trip when streaming list views
+STREAM_BATCH_SIZE = 500
+
+# Dialect-specific INSERT constructs that support ON CONFLICT DO NOTHING
+_INSERT_BY_DIALECT = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+
 # TENANTS_FILE = "tenants.json" # No longer needed
 
 # def get_tenants(): # No longer needed
@@ -19,27 +28,42 @@ app = Flask(__name__)
 def initialize_database():
     init_db()
 
+@app.teardown_appcontext
+def remove_session(exception=None):
+    Session.remove()
+
+def with_db(view):
+    """Pass the request-scoped session to the view, rolling back on error"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        db = Session()
+        try:
+            return view(db, *args, **kwargs)
+        except Exception:
+            db.rollback()
+            raise
+    return wrapper
+
 @app.route("/")
 def index():
     return render_template("index.html")
 
 @app.route("/tenants", methods=["GET", "POST"])
-def tenants():
-    db = SessionLocal()
-    try:
-        if request.method == "POST":
-            tenant_name = request.form["tenant_name"]
-            existing_tenant = db.query(Tenant).filter(Tenant.name == tenant_name).first()
-            if not existing_tenant:
-                new_tenant = Tenant(id=str(uuid.uuid4()), name=tenant_name)
-                db.add(new_tenant)
-                db.commit()
-                db.refresh(new_tenant)
-            return redirect(url_for("tenants"))
-        tenants = db.query(Tenant).all()
-        return render_template("tenants.html", tenants=tenants)
-    finally:
-        db.close()
+@with_db
+def tenants(db):
+    if request.method == "POST":
+        tenant_name = request.form["tenant_name"]
+        # Single round-trip; the UNIQUE constraint on name rejects duplicates
+        insert = _INSERT_BY_DIALECT[db.get_bind().dialect.name]
+        db.execute(
+            insert(Tenant)
+            .values(id=token_hex(16), name=tenant_name)
+            .on_conflict_do_nothing(index_elements=["name"])
+        )
+        db.commit()
+        return redirect(url_for("tenants"))
+    tenants = db.query(Tenant).yield_per(STREAM_BATCH_SIZE)
+    return stream_template("tenants.html", tenants=tenants)
 
 @app.route("/status")
 def status():
@@ -48,19 +72,19 @@ def status():
     return render_template("status.html", system_status="OK")
 
 @app.route("/messages")
-def messages():
-    db = SessionLocal()
-    try:
-        messages = db.query(Message).all()
-        # Decrypt payload for display
-        for message in messages:
-            try:
-                message.payload = decrypt_data(message.payload.encode('utf-8')).decode('utf-8')
-            except Exception as e:
-                message.payload = f"Decryption Error: {e} (Raw: {message.payload})"
-        return render_template("messages.html", messages=messages)
-    finally:
-        db.close()
+@with_db
+def messages(db):
+    messages = db.query(Message).yield_per(STREAM_BATCH_SIZE)
+    return stream_template("messages.html", messages=_decrypted(messages))
+
+def _decrypted(messages):
+    """Decrypt payloads for display as rows are streamed to the template"""
+    for message in messages:
+        try:
+            message.payload = decrypt_data(message.payload.encode('utf-8')).decode('utf-8')
+        except Exception as e:
+            message.payload = f"Decryption Error: {e} (Raw: {message.payload})"
+        yield message
 
 if __name__ == "__main__":
     app.run(debug=True, host="0.0.0.0")
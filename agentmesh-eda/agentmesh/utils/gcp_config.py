@@ -19,6 +19,7 @@ class GoogleCloudConfig:
         self.project_id = project_id or os.getenv("GOOGLE_CLOUD_PROJECT")
         self.location = location or os.getenv("GOOGLE_CLOUD_LOCATION", "us-central1")
         self.credentials = None
+        self._vertex_ready = False
         
         # Validate required configuration
         if not self.project_id:
@@ -27,8 +28,7 @@ class GoogleCloudConfig:
         # Initialize credentials
         self._initialize_credentials()
         
-        # Initialize Vertex AI
-        self._initialize_vertex_ai()
+        # Vertex AI is initialized lazily on first use (see ensure_vertex_ai)
     
     def _initialize_credentials(self):
         """
@@ -64,6 +64,14 @@ class GoogleCloudConfig:
             logger.error(f"Error initializing Vertex AI: {e}")
             raise
     
+    def ensure_vertex_ai(self):
+        """
+        Initialize Vertex AI on first use; later calls are no-ops
+        """
+        if not self._vertex_ready:
+            self._initialize_vertex_ai()
+            self._vertex_ready = True
+    
     def get_project_id(self) -> str:
         """
         Get the configured project ID
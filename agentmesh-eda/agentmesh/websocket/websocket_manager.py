@@ -16,39 +16,101 @@ import asyncio
 import json
 import logging
 import time
-from typing import Dict, List, Optional, Callable, Any, Set
-from dataclasses import dataclass, asdict
-from enum import Enum
+from collections import defaultdict
+from typing import Dict, List, Optional, Callable, Any, Set, Tuple, Union
+from dataclasses import dataclass, field
+from enum import IntEnum
 from datetime import datetime
 import hashlib
+import itertools
 import secrets
+import zlib
+import msgpack
+import orjson
 from fastapi import WebSocket, WebSocketDisconnect
 from fastapi.websockets import WebSocketDisconnect as FastAPIWebSocketDisconnect
 from starlette.websockets import WebSocketState
 from loguru import logger
-from agentmesh.middleware.rate_limiting import APIKeyValidator, generate_secure_token
+from agentmesh.middleware.security import APIKeyValidator, generate_secure_token
 
 
-class MessageType(str, Enum):
-    """WebSocket message types"""
+class MessageType(IntEnum):
+    """WebSocket message types, sent on the wire as their integer value"""
     # Connection management
-    CONNECT = "connect"
-    DISCONNECT = "disconnect"
-    PING = "ping"
-    PONG = "pong"
-    AUTH = "auth"
-    AUTH_RESPONSE = "auth_response"
-    ERROR = "error"
+    CONNECT = 0
+    DISCONNECT = 1
+    PING = 2
+    PONG = 3
+    AUTH = 4
+    AUTH_RESPONSE = 5
+    ERROR = 6
     
     # Real-time data
-    AGENT_STATUS_UPDATE = "agent_status_update"
-    TASK_UPDATE = "task_update"
-    SYSTEM_EVENT = "system_event"
-    METRICS_UPDATE = "metrics_update"
-    NOTIFICATION = "notification"
+    AGENT_STATUS_UPDATE = 7
+    TASK_UPDATE = 8
+    SYSTEM_EVENT = 9
+    METRICS_UPDATE = 10
+    NOTIFICATION = 11
+    
+    # Several queued messages merged into one frame; "data" holds the messages
+    BATCH = 12
+
+
+# Wire encodings, negotiated per connection via the Sec-WebSocket-Protocol header.
+# MessagePack frames are binary; JSON text frames remain as a fallback for
+# clients that don't offer "msgpack". Both carry the message type as its int code.
+MSGPACK = "msgpack"
+JSON = "json"
+
+_PACKER = msgpack.Packer(use_bin_type=True, datetime=False)
+
+# Binary frames start with a one-byte flag telling the peer whether the MessagePack
+# body is zlib-compressed. Large frames are compressed once here, when the message
+# is encoded, instead of by permessage-deflate once per socket, so run the server
+# with that extension disabled (e.g. uvicorn --ws-per-message-deflate false).
+_FRAME_RAW = b"\x00"
+_FRAME_ZLIB = b"\x01"
+COMPRESSION_THRESHOLD = 512  # Bytes of packed payload before a frame is compressed
+
+
+# Message timestamps have one-second granularity, so the ISO string is rebuilt
+# at most once per second and shared by every message created within it
+_ts_cache = {"sec": -1, "str": ""}
+
 
+def _timestamp() -> str:
+    """Current UTC time as an ISO-8601 string, cached per second"""
+    now = int(time.time())
+    if now != _ts_cache["sec"]:
+        _ts_cache["sec"] = now
+        _ts_cache["str"] = datetime.utcfromtimestamp(now).isoformat()
+    return _ts_cache["str"]
 
-@dataclass
+
+def _is_compressed(frame: Union[bytes, str]) -> bool:
+    return isinstance(frame, bytes) and frame[:1] == _FRAME_ZLIB
+
+
+def _merge_frames(frames: List[Union[bytes, str]]) -> Union[bytes, str]:
+    """
+    Wrap already-encoded, uncompressed frames in a single BATCH envelope without
+    re-encoding.
+    
+    For MessagePack the envelope map and array headers are written by hand and the
+    packed messages appended verbatim; for JSON the text frames are joined.
+    """
+    if isinstance(frames[0], bytes):
+        return b"".join((
+            _FRAME_RAW,
+            _PACKER.pack_map_header(2),
+            _PACKER.pack("type"), _PACKER.pack(MessageType.BATCH.value),
+            _PACKER.pack("data"), _PACKER.pack_array_header(len(frames)),
+            *(frame[1:] for frame in frames),
+        ))
+    return f'{{"type":{MessageType.BATCH.value},"data":[{",".join(frames)}]}}'
+
+
+@dataclass(slots=True)
 class WebSocketMessage:
     """WebSocket message structure"""
     type: MessageType
@@ -56,29 +118,46 @@ class WebSocketMessage:
     timestamp: str = None
     message_id: Optional[str] = None
     connection_id: Optional[str] = None
+    
+    def as_payload(self) -> Dict[str, Any]:
+        """Plain dict of the message fields, without asdict's recursive copy"""
+        return {
+            "type": self.type.value,
+            "data": self.data,
+            "timestamp": self.timestamp,
+            "message_id": self.message_id,
+            "connection_id": self.connection_id,
+        }
 
 
-@dataclass
+@dataclass(eq=False, slots=True)
 class ClientConnection:
-    """Represents a WebSocket client connection"""
+    """Represents a WebSocket client connection (hashed by identity)"""
     websocket: WebSocket
     connection_id: str
     user_id: Optional[str] = None
     tenant_id: Optional[str] = None
     api_permissions: List[str] = None
-    subscribed_channels: Set[str] = None
+    claims: Optional[Tuple[Optional[str], Optional[str], List[str]]] = None  # Decoded token, parsed once
+    subscribed_channels: Set[str] = field(default_factory=set)
     last_ping: float = 0
+    last_ping_sent: float = 0
     is_authenticated: bool = False
     connected_at: datetime = None
+    encoding: str = JSON
+    out_queue: asyncio.Queue = None
+    writer_task: Optional[asyncio.Task] = None
+    pending_pongs: Dict[str, asyncio.Future] = field(default_factory=dict)
+    closed: bool = False  # Set once the socket is seen closed; later sends are dropped
 
 
-@dataclass
+@dataclass(slots=True)
 class ChannelSubscription:
     """Channel subscription information"""
     name: str
-    subscribers: Set[str] = Set[str]()
-    permissions: List[str] = []
-    last_activity: datetime
+    subscribers: Set[ClientConnection] = field(default_factory=set)
+    permissions: List[str] = field(default_factory=list)
+    last_activity: datetime = None
 
 
 class WebSocketManager:
@@ -87,22 +166,36 @@ class WebSocketManager:
     def __init__(self):
         self.connections: Dict[str, ClientConnection] = {}
         self.channels: Dict[str, ChannelSubscription] = {}
-        self.message_handlers: Dict[MessageType, List[Callable]] = {}
-        self.broadcast_handlers: List[Callable] = []
+        # Indexed by MessageType value. Tuples are replaced on registration so
+        # dispatch iterates a stable snapshot even if a handler registers another.
+        self.message_handlers: List[Tuple[Callable, ...]] = [() for _ in MessageType]
+        self.broadcast_handlers: Tuple[Callable, ...] = ()
         self.redis_available = False  # Could add Redis for distributed WebSocket
         self.connection_timeout = 300  # 5 minutes
         self.max_connections_per_user = 5
+        self.max_connections_per_tenant = 100
         self.max_global_connections = 1000
+        # Live connection counts, kept in step with self.connections
+        self._user_counts: Dict[str, int] = defaultdict(int)
+        self._tenant_counts: Dict[str, int] = defaultdict(int)
+        # Message ids only correlate frames within this process: random prefix + counter
+        self._id_prefix = secrets.token_urlsafe(6)
+        self._id_counter = itertools.count()
+        self.max_outbound_queue = 256  # Frames buffered per client before it's dropped as slow
+        self.batch_window = 0.005  # Seconds the writer waits to coalesce queued frames
+        self.max_batch_size = 64
+        self.ping_interval = 30  # Seconds between pings to a connection
+        self.pong_timeout = 10.0
+        self.heartbeat_sweep_interval = 5  # One sweeper task pings every due connection
+        self._heartbeat_task: Optional[asyncio.Task] = None
         
     def register_handler(self, message_type: MessageType, handler: Callable):
         """Register a message handler"""
-        if message_type not in self.message_handlers:
-            self.message_handlers[message_type] = []
-        self.message_handlers[message_type].append(handler)
+        self.message_handlers[message_type] = (*self.message_handlers[message_type], handler)
     
     def register_broadcast_handler(self, handler: Callable):
         """Register a broadcast handler"""
-        self.broadcast_handlers.append(handler)
+        self.broadcast_handlers = (*self.broadcast_handlers, handler)
     
     async def connect(self, websocket: WebSocket, connection_id: str, token: Optional[str] = None):
         """Handle new WebSocket connection"""
@@ -111,38 +204,53 @@ class WebSocketManager:
             user_id = None
             tenant_id = None
             api_permissions = ["read", "write"]
+            claims = None
             
             if token:
                 # Validate token and extract user info
-                user_id = self._extract_user_id_from_token(token)
-                tenant_id = self._extract_tenant_id_from_token(token)
-                api_permissions = self._extract_permissions_from_token(token)
+                claims = self._decode_token(token)
+                user_id, tenant_id, api_permissions = claims
                 
                 if not self._validate_user_connections(user_id, tenant_id):
                     await websocket.close(code=4001, reason="Too many connections")
                     return
             
+            # Prefer MessagePack when the client offers it as a subprotocol
+            offered = websocket.scope.get("subprotocols", [])
+            encoding = MSGPACK if MSGPACK in offered else JSON
+            await websocket.accept(subprotocol=encoding if encoding in offered else None)
+            
             client = ClientConnection(
                 websocket=websocket,
                 connection_id=connection_id,
                 user_id=user_id,
                 tenant_id=tenant_id,
                 api_permissions=api_permissions,
-                connected_at=datetime.utcnow()
+                claims=claims,
+                subscribed_channels=set(),
+                last_ping_sent=time.time(),
+                connected_at=datetime.utcnow(),
+                encoding=encoding,
+                out_queue=asyncio.Queue(maxsize=self.max_outbound_queue)
             )
             
             self.connections[connection_id] = client
+            self._track(client)
+            
+            # A single writer task owns the socket's send side
+            client.writer_task = asyncio.create_task(self._writer_loop(client))
             
             # Send connection confirmation
-            await self._send_to_client(client, {
-                "type": MessageType.CONNECT,
-                "data": {"connection_id": connection_id, "status": "connected"},
-                "timestamp": datetime.utcnow().isoformat(),
-                "message_id": self._generate_message_id()
-            })
+            await self._send_to_client(client, WebSocketMessage(
+                type=MessageType.CONNECT,
+                data={"connection_id": connection_id, "status": "connected"},
+                timestamp=_timestamp(),
+                message_id=self._generate_message_id()
+            ))
             
-            # Setup ping/pong for connection health
-            asyncio.create_task(self._ping_loop(client))
+            # Make sure the shared heartbeat sweeper is running
+            if self._heartbeat_task is None or self._heartbeat_task.done():
+                self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
             
             logger.info(f"WebSocket connected: {connection_id} for user: {user_id}")
             
@@ -152,58 +260,171 @@ class WebSocketManager:
     
     async def disconnect(self, connection_id: str):
         """Handle WebSocket disconnection"""
-        if connection_id in self.connections:
-            client = self.connections[connection_id]
-            
-            # Unsubscribe from all channels
-            for channel_name in client.subscribed_channels:
-                if channel_name in self.channels:
-                    self.channels[channel_name].subscribers.discard(connection_id)
-            
-            del self.connections[connection_id]
-            
-            # Notify other handlers
-            await self._notify_handlers({
-                "type": MessageType.DISCONNECT,
-                "data": {
-                    "connection_id": connection_id,
-                    "user_id": client.user_id,
-                    "reason": "Disconnected",
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "message_id": self._generate_message_id()
-                }
-            }, connection_id=connection_id)
-            
-            logger.info(f"WebSocket disconnected: {connection_id}")
+        client = self.connections.pop(connection_id, None)
+        if client is None:
+            return
+        client.closed = True
+        self._untrack(client)
+        
+        # Stop the writer; frames still queued for a closed socket are dropped
+        if client.writer_task and client.writer_task is not asyncio.current_task():
+            client.writer_task.cancel()
+        
+        # Unsubscribe from all channels
+        for channel_name in client.subscribed_channels:
+            self._leave_channel(client, channel_name)
+        
+        # Notify other handlers
+        await self._notify_handlers(WebSocketMessage(
+            type=MessageType.DISCONNECT,
+            data={
+                "connection_id": connection_id,
+                "user_id": client.user_id,
+                "reason": "Disconnected",
+                "timestamp": _timestamp(),
+                "message_id": self._generate_message_id()
+            }
+        ), connection_id=connection_id)
+        
+        logger.info(f"WebSocket disconnected: {connection_id}")
+    
+    def _encode(self, message: WebSocketMessage, encoding: str) -> Union[bytes, str]:
+        """Encode message as a wire frame for the given encoding"""
+        if encoding == MSGPACK:
+            packed = _PACKER.pack(message.as_payload())
+            if len(packed) > COMPRESSION_THRESHOLD:
+                return _FRAME_ZLIB + zlib.compress(packed, 1)
+            return _FRAME_RAW + packed
+        # orjson serializes the dataclass (and IntEnum type) directly, no asdict copy
+        return orjson.dumps(message).decode()
+    
+    async def _send_frame(self, client: ClientConnection, frame: Union[bytes, str]):
+        """Write an already-encoded frame to the client socket"""
+        # Skip building a frame Starlette would only reject on a closed socket
+        if client.closed or client.websocket.client_state != WebSocketState.CONNECTED:
+            client.closed = True
+            return
+        if isinstance(frame, bytes):
+            await client.websocket.send_bytes(frame)
+        else:
+            await client.websocket.send_text(frame)
+    
+    def _enqueue(self, client: ClientConnection, frame: Union[bytes, str]) -> bool:
+        """Queue a frame for the client's writer; False if the client should be dropped"""
+        if client.closed or client.websocket.client_state != WebSocketState.CONNECTED:
+            client.closed = True
+            return False
+        try:
+            client.out_queue.put_nowait(frame)
+            return True
+        except asyncio.QueueFull:
+            logger.warning(f"Dropping slow WebSocket consumer: {client.connection_id}")
+            return False
+    
+    async def _writer_loop(self, client: ClientConnection):
+        """Drain the client's outbound queue onto its socket"""
+        queue = client.out_queue
+        try:
+            while True:
+                frame = await queue.get()
+                
+                # Give a burst a short window to accumulate, then send it as one frame
+                if self.batch_window and queue.empty():
+                    await asyncio.sleep(self.batch_window)
+                if queue.empty():
+                    await self._send_frame(client, frame)
+                    continue
+                
+                batch = [frame]
+                while len(batch) < self.max_batch_size and not queue.empty():
+                    batch.append(queue.get_nowait())
+                await self._send_batch(client, batch)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"WebSocket writer error for connection {client.connection_id}: {e}")
+            await self.disconnect(client.connection_id)
+    
+    async def _send_batch(self, client: ClientConnection, batch: List[Union[bytes, str]]):
+        """Send queued frames in order, merging runs of uncompressed frames"""
+        run = []
+        for frame in batch:
+            if _is_compressed(frame):
+                if run:
+                    await self._send_frame(client, _merge_frames(run) if len(run) > 1 else run[0])
+                    run = []
+                await self._send_frame(client, frame)
+            else:
+                run.append(frame)
+        if run:
+            await self._send_frame(client, _merge_frames(run) if len(run) > 1 else run[0])
     
     async def _send_to_client(self, client: ClientConnection, message: WebSocketMessage):
         """Send message to specific client"""
         try:
-            message_json = json.dumps(asdict(message))
-            await client.websocket.send_text(message_json)
+            frame = self._encode(message, client.encoding)
         except Exception as e:
-            logger.error(f"Failed to send WebSocket message: {e}")
+            logger.error(f"Failed to encode WebSocket message: {e}")
+            return
+        
+        if not self._enqueue(client, frame):
+            await self.disconnect(client.connection_id)
     
-    async def _broadcast_to_all(self, message: WebSocketMessage, exclude_connection: Optional[str] = None):
-        """Broadcast message to all connected clients"""
-        for conn_id, client in self.connections.items():
-            if exclude_connection and conn_id == exclude_connection:
+    async def _fan_out(self, clients, message: WebSocketMessage, exclude_connection: Optional[str] = None):
+        """Send one message to many clients, encoding it once per wire encoding"""
+        frames: Dict[str, Union[bytes, str]] = {}
+        slow_connections = []
+        
+        for client in clients:
+            if exclude_connection and client.connection_id == exclude_connection:
                 continue
             
-            await self._send_to_client(client, message)
+            frame = frames.get(client.encoding)
+            if frame is None:
+                frame = frames[client.encoding] = self._encode(message, client.encoding)
+            
+            # Every queue holds a reference to the same frame object
+            if not self._enqueue(client, frame):
+                slow_connections.append(client.connection_id)
+        
+        # Clean up after the loop so the connection map isn't mutated mid-iteration
+        if slow_connections:
+            await self._disconnect_all(slow_connections)
+    
+    async def _disconnect_all(self, connection_ids: List[str]):
+        """Disconnect several clients concurrently so one slow handler can't serialize the rest"""
+        results = await asyncio.gather(
+            *(self.disconnect(conn_id) for conn_id in connection_ids),
+            return_exceptions=True
+        )
+        for conn_id, result in zip(connection_ids, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to disconnect WebSocket {conn_id}: {result}")
+    
+    async def _broadcast_to_all(self, message: WebSocketMessage, exclude_connection: Optional[str] = None):
+        """Broadcast message to all connected clients"""
+        # Snapshot so connects/disconnects during the fan-out can't resize what we iterate
+        await self._fan_out(tuple(self.connections.values()), message, exclude_connection)
     
     async def _broadcast_to_channel(self, channel_name: str, message: WebSocketMessage, exclude_connection: Optional[str] = None):
         """Broadcast message to channel subscribers"""
         if channel_name in self.channels:
-            for conn_id in self.channels[channel_name].subscribers:
-                if exclude_connection and conn_id == exclude_connection:
-                    continue
-                    
-                await self._send_to_client(self.connections[conn_id], message)
+            subscribers = self.channels[channel_name].subscribers
+            
+            # Prune subscribers whose connection is gone so they can't accumulate
+            stale = [client for client in subscribers
+                     if self.connections.get(client.connection_id) is not client]
+            if stale:
+                subscribers.difference_update(stale)
+                if not subscribers:
+                    del self.channels[channel_name]
+                    return
+            
+            await self._fan_out(tuple(subscribers), message, exclude_connection)
     
     async def _notify_handlers(self, message: WebSocketMessage, connection_id: Optional[str] = None):
         """Notify all registered handlers"""
-        for handler in self.message_handlers.get(message.type, []):
+        for handler in self.message_handlers[message.type]:
             try:
                 await handler(message, connection_id)
             except Exception as e:
@@ -215,127 +436,110 @@ class WebSocketManager:
             except Exception as e:
                 logger.error(f"WebSocket broadcast handler error: {e}")
     
-    async def _ping_loop(self, client: ClientConnection):
-        """Maintain connection with ping/pong"""
-        while client.connection_id in self.connections:
-            try:
-                await asyncio.sleep(30)  # Ping every 30 seconds
-                
-                ping_message = WebSocketMessage(
-                    type=MessageType.PING,
-                    timestamp=datetime.utcnow().isoformat(),
-                    message_id=self._generate_message_id()
-                )
-                
-                await self._send_to_client(client, ping_message)
-                
-                # Wait for pong with timeout
+    async def _heartbeat_loop(self):
+        """Ping idle connections and drop unresponsive ones from a single task"""
+        while self.connections:
+            await asyncio.sleep(self.heartbeat_sweep_interval)
+            now = time.time()
+            timed_out = []
+            
+            for client in tuple(self.connections.values()):
                 try:
-                    pong_response = await asyncio.wait_for(
-                        self._wait_for_pong(client),
-                        timeout=10.0
-                    )
-                    logger.debug(f"Pong received for connection {client.connection_id}")
-                except asyncio.TimeoutError:
-                    logger.warning(f"Pong timeout for connection {client.connection_id}")
-                    # Connection may be dead, consider disconnecting
-                    break
-                
-            except Exception as e:
-                logger.error(f"Ping loop error for connection {client.connection_id}: {e}")
-                break
+                    if client.pending_pongs:
+                        if now - client.last_ping_sent > self.pong_timeout:
+                            logger.warning(f"Pong timeout for connection {client.connection_id}")
+                            timed_out.append(client.connection_id)
+                    elif now - client.last_ping_sent >= self.ping_interval:
+                        await self._send_ping(client, now)
+                except Exception as e:
+                    logger.error(f"Heartbeat error for connection {client.connection_id}: {e}")
+            
+            if timed_out:
+                await self._disconnect_all(timed_out)
     
-    async def _wait_for_pong(self, client: ClientConnection, timeout: float = 10.0):
-        """Wait for pong response"""
-        start_time = time.time()
+    async def _send_ping(self, client: ClientConnection, now: float):
+        """Send a PING and register the future its PONG will resolve"""
+        ping_message = WebSocketMessage(
+            type=MessageType.PING,
+            timestamp=_timestamp(),
+            message_id=self._generate_message_id()
+        )
         
-        while client.connection_id in self.connections and time.time() - start_time < timeout:
-            try:
-                message = await client.websocket.receive_text()
-                data = json.loads(message)
-                
-                if data.get("type") == MessageType.PONG and data.get("message_id") == client.last_ping_id:
-                    return data
-            except Exception as e:
-                logger.error(f"Pong wait error: {e}")
-                raise asyncio.TimeoutError()
+        # handle_message resolves this future when the matching PONG arrives
+        client.pending_pongs[ping_message.message_id] = asyncio.get_running_loop().create_future()
+        client.last_ping_sent = now
         
-        raise asyncio.TimeoutError("Pong timeout")
+        await self._send_to_client(client, ping_message)
     
     def _generate_message_id(self) -> str:
         """Generate unique message ID"""
+        return f"{self._id_prefix}-{next(self._id_counter)}"
+    
+    def _generate_connection_id(self) -> str:
+        """Generate an unguessable connection ID"""
         return secrets.token_urlsafe(16)
     
-    def _extract_user_id_from_token(self, token: str) -> Optional[str]:
-        """Extract user ID from JWT token"""
-        try:
-            # Simple token parsing - in production, use proper JWT library
-            # This is a simplified implementation
-            if "." in token:
-                parts = token.split(".")
-                if len(parts) >= 2:
-                    user_part = parts[0]
-                    if user_part.startswith("user_"):
-                        return user_part[5:]  # Remove "user_" prefix
-                    return user_part
-            return None
-        except Exception:
-            return None
-    
-    def _extract_tenant_id_from_token(self, token: str) -> Optional[str]:
-        """Extract tenant ID from JWT token"""
-        try:
-            if "." in token:
-                parts = token.split(".")
-                if len(parts) >= 2:
-                    tenant_part = parts[0]
-                    if tenant_part.startswith("tenant_"):
-                        return tenant_part[5:]  # Remove "tenant_" prefix
-                    return tenant_part
-            return None
-        except Exception:
-            return None
-    
-    def _extract_permissions_from_token(self, token: str) -> List[str]:
-        """Extract permissions from JWT token"""
-        try:
-            # Simple token parsing for demo
-            return ["read", "write"]  # In production, extract from JWT claims
-        except Exception:
-            return ["read"]  # Default permissions
+    def _decode_token(self, token: str) -> Tuple[Optional[str], Optional[str], List[str]]:
+        """Extract user ID, tenant ID and permissions from a token in one pass"""
+        # Simple token parsing - in production, use proper JWT library
+        # This is a simplified implementation
+        if "." not in token:
+            return None, None, ["read", "write"]
+        
+        head = token.partition(".")[0]
+        user_id = head[len("user_"):] if head.startswith("user_") else head
+        tenant_id = head[len("tenant_"):] if head.startswith("tenant_") else head
+        
+        # In production, extract permissions from JWT claims
+        return user_id, tenant_id, ["read", "write"]
     
     def _validate_user_connections(self, user_id: str, tenant_id: str) -> bool:
         """Validate user connection limits"""
         if not user_id or not tenant_id:
             return True
         
-        user_connections = len([
-            conn for conn in self.connections.values()
-            if conn.user_id == user_id
-        ])
-        
-        tenant_connections = len([
-            conn for conn in self.connections.values()
-            if conn.tenant_id == tenant_id
-        ])
-        
-        return (user_connections < self.max_connections_per_user and 
-                tenant_connections < self.max_connections_per_user)
+        return (self._user_counts.get(user_id, 0) < self.max_connections_per_user and
+                self._tenant_counts.get(tenant_id, 0) < self.max_connections_per_tenant)
+    
+    def _track(self, client: ClientConnection):
+        """Count a live connection against its user and tenant"""
+        if client.user_id:
+            self._user_counts[client.user_id] += 1
+        if client.tenant_id:
+            self._tenant_counts[client.tenant_id] += 1
     
-    async def handle_message(self, websocket: WebSocket, message: str, connection_id: str):
-        """Handle incoming WebSocket message"""
+    def _untrack(self, client: ClientConnection):
+        """Release a connection's user and tenant counts, dropping zeroed entries"""
+        for counts, key in ((self._user_counts, client.user_id), (self._tenant_counts, client.tenant_id)):
+            if key and key in counts:
+                counts[key] -= 1
+                if counts[key] <= 0:
+                    del counts[key]
+    
+    async def handle_message(self, websocket: WebSocket, message: Union[str, bytes], connection_id: str):
+        """Handle incoming WebSocket message (binary MessagePack or JSON text frame)"""
         try:
             client = self.connections.get(connection_id)
             if not client:
                 logger.warning(f"Received message for unknown connection: {connection_id}")
                 return
             
-            data = json.loads(message)
+            if isinstance(message, bytes):
+                body = message[1:]
+                if message[:1] == _FRAME_ZLIB:
+                    body = zlib.decompress(body)
+                data = msgpack.unpackb(body, raw=False, use_list=False)
+            else:
+                data = json.loads(message)
+            data["type"] = MessageType(data["type"])
             message_obj = WebSocketMessage(**data)
             
-            # Update last ping time
+            # Update last ping time and wake the ping loop waiting on this pong
             if message_obj.type == MessageType.PONG:
                 client.last_ping = time.time()
+                pong = client.pending_pongs.pop(message_obj.message_id, None)
+                if pong is not None and not pong.done():
+                    pong.set_result(message_obj)
             
             # Route message to appropriate handler
             await self._notify_handlers(message_obj, connection_id)
@@ -346,24 +550,36 @@ class WebSocketManager:
     
     async def authenticate_connection(self, websocket: WebSocket, connection_id: str, token: str):
         """Authenticate WebSocket connection"""
-        user_id = self._extract_user_id_from_token(token)
-        tenant_id = self._extract_tenant_id_from_token(token)
-        
-        if not self._validate_user_connections(user_id, tenant_id):
-            await websocket.close(code=4001, reason="Too many connections")
+        client = self.connections.get(connection_id)
+        if not client:
+            logger.warning(f"Authentication for unknown connection: {connection_id}")
             return False
         
-        # Update client with authentication info
-        client = self.connections[connection_id]
-        client.user_id = user_id
-        client.tenant_id = tenant_id
+        if client.claims is not None:
+            # connect() already decoded this token and enforced connection limits
+            user_id, tenant_id, _ = client.claims
+        else:
+            client.claims = self._decode_token(token)
+            user_id, tenant_id, api_permissions = client.claims
+            
+            if not self._validate_user_connections(user_id, tenant_id):
+                await websocket.close(code=4001, reason="Too many connections")
+                return False
+            
+            # Update client with authentication info
+            self._untrack(client)
+            client.user_id = user_id
+            client.tenant_id = tenant_id
+            client.api_permissions = api_permissions
+            self._track(client)
+        
         client.is_authenticated = True
         
         # Send authentication success
         auth_response = WebSocketMessage(
             type=MessageType.AUTH_RESPONSE,
             data={"status": "authenticated", "user_id": user_id, "tenant_id": tenant_id},
-            timestamp=datetime.utcnow().isoformat(),
+            timestamp=_timestamp(),
             message_id=self._generate_message_id()
         )
         
@@ -387,9 +603,11 @@ class WebSocketManager:
         
         # Validate permissions
         if not self._validate_channel_permissions(client, self.channels[channel_name], permissions):
+            if not self.channels[channel_name].subscribers:
+                del self.channels[channel_name]
             return False
         
-        self.channels[channel_name].subscribers.add(connection_id)
+        self.channels[channel_name].subscribers.add(client)
         client.subscribed_channels.add(channel_name)
         
         # Send subscription confirmation
@@ -398,12 +616,43 @@ class WebSocketManager:
             data={
                 "action": "subscribed",
                 "channel": channel_name,
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": _timestamp(),
+                "message_id": self._generate_message_id()
+            }
+        )
+        
+        await self._send_to_client(client, response)
+    
+    async def unsubscribe_from_channel(self, connection_id: str, channel_name: str):
+        """Unsubscribe client from a channel"""
+        client = self.connections.get(connection_id)
+        if not client or channel_name not in client.subscribed_channels:
+            return False
+        
+        client.subscribed_channels.discard(channel_name)
+        self._leave_channel(client, channel_name)
+        
+        # Send unsubscription confirmation
+        response = WebSocketMessage(
+            type=MessageType.NOTIFICATION,
+            data={
+                "action": "unsubscribed",
+                "channel": channel_name,
+                "timestamp": _timestamp(),
                 "message_id": self._generate_message_id()
             }
         )
         
         await self._send_to_client(client, response)
+        return True
+    
+    def _leave_channel(self, client: ClientConnection, channel_name: str):
+        """Remove client from a channel, dropping the channel once it has no subscribers"""
+        channel = self.channels.get(channel_name)
+        if channel is not None:
+            channel.subscribers.discard(client)
+            if not channel.subscribers:
+                del self.channels[channel_name]
     
     def _validate_channel_permissions(self, client: ClientConnection, channel: ChannelSubscription, permissions: List[str]) -> bool:
         """Validate if client has required permissions for channel"""
@@ -429,15 +678,14 @@ class WebSocketEndpoint:
     
     async def __call__(self, websocket: WebSocket, token: Optional[str] = None):
         """Handle WebSocket connection"""
-        connection_id = self.manager._generate_message_id()
+        connection_id = self.manager._generate_connection_id()
         
-        # Authenticate if token provided
-        if token:
-            if not await self.manager.authenticate_connection(websocket, connection_id, token):
-                return
+        # Connect first; without a token this is a public connection
+        await self.manager.connect(websocket, connection_id, token)
         
-        # Connect without authentication (public connections)
-        await self.manager.connect(websocket, connection_id)
+        # Authenticate if token provided, reusing the claims decoded by connect()
+        if token:
+            await self.manager.authenticate_connection(websocket, connection_id, token)
     
     async def send_agent_update(self, agent_id: str, status: str, metadata: Dict[str, Any] = None):
         """Broadcast agent status update to relevant subscribers"""
@@ -447,7 +695,7 @@ class WebSocketEndpoint:
                 "agent_id": agent_id,
                 "status": status,
                 "metadata": metadata or {},
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": _timestamp(),
                 "message_id": self.manager._generate_message_id()
             }
         )
@@ -463,7 +711,7 @@ class WebSocketEndpoint:
                 "status": status,
                 "agent_id": agent_id,
                 "metadata": metadata or {},
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": _timestamp(),
                 "message_id": self.manager._generate_message_id()
             }
         )
@@ -477,7 +725,7 @@ class WebSocketEndpoint:
             data={
                 "event_type": event_type,
                 "data": data,
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": _timestamp(),
                 "message_id": self.manager._generate_message_id()
             }
         )
@@ -492,16 +740,16 @@ class WebSocketEndpoint:
                 "message": message,
                 "level": level,
                 "target": target,
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": _timestamp(),
                 "message_id": self.manager._generate_message_id()
             }
         )
         
         if target:
             # Send to specific users by connection ID
-            for target_connection_id in target:
-                if target_connection_id in self.manager.connections:
-                    await self.manager._send_to_client(self.manager.connections[target_connection_id], message_obj)
+            connections = self.manager.connections
+            clients = [connections[conn_id] for conn_id in target if conn_id in connections]
+            await self.manager._fan_out(clients, message_obj)
         else:
             # Broadcast to all
             await self.manager._broadcast_to_all(message_obj)
@@ -511,9 +759,8 @@ class WebSocketEndpoint:
         message = WebSocketMessage(
             type=MessageType.METRICS_UPDATE,
             data=metrics,
-            "timestamp": datetime.utcnow().isoformat(),
-            "message_id": self.manager._generate_message_id()
-            }
+            timestamp=_timestamp(),
+            message_id=self.manager._generate_message_id()
         )
         
         await self.manager._broadcast_to_all(message)
@@ -528,12 +775,15 @@ async def create_websocket_endpoint(
     """Create and return a WebSocket endpoint"""
     
     async def websocket_endpoint(websocket: WebSocket, token: Optional[str] = None):
-        connection_id = manager._generate_message_id()
+        connection_id = manager._generate_connection_id()
         
-        if token_required:
-            if not await manager.authenticate_connection(websocket, connection_id, token):
-                return
+        if token_required and not token:
+            await websocket.close(code=4001, reason="Authentication required")
+            return
+        
+        await manager.connect(websocket, connection_id, token)
         
-        await manager.connect(websocket, connection_id)
+        if token:
+            await manager.authenticate_connection(websocket, connection_id, token)
     
     return websocket_endpoint
\ No newline at end of file
@@ -9,13 +9,19 @@ Provides:
 - Pytest configuration and marks
 """
 
+import copy
 import os
 import pytest
-import asyncio
 import logging
-from datetime import timedelta, datetime
+from collections import defaultdict
+from collections.abc import Mapping
+from datetime import timedelta
+from typing import Dict
 from unittest.mock import AsyncMock, MagicMock
 
+import orjson
+from pytest_asyncio import is_async_test
+
 # Set required environment variables before any lazy initialization
 os.environ.setdefault("ENCRYPTION_KEY", "pQKcaduh-gF3PDrZ56uJzcJOt4X10AgthjJETVxVNQM=")
 os.environ.setdefault("JWT_SECRET_KEY", "test-jwt-secret-key-for-testing-only")
@@ -23,21 +29,11 @@ os.environ.setdefault("JWT_SECRET_KEY", "test-jwt-secret-key-for-testing-only")
 from agentmesh.security.auth import create_access_token
 
 
-# ===== PYTEST CONFIGURATION =====
-
-@pytest.fixture(scope="session")
-def event_loop():
-    """Create event loop for async tests"""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
-
-
 # ===== AUTHENTICATION FIXTURES =====
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def valid_token():
-    """Generate valid auth token"""
+    """Generate valid auth token, signed once and shared by the whole session"""
     data = {"sub": "testuser", "roles": ["agent"]}
     token = create_access_token(data, tenant_id="test_tenant", expires_delta=timedelta(days=3650))
     return token
@@ -60,237 +56,372 @@ def test_request_id():
     return "req-abc-123"
 
 
+# ===== IN-MEMORY IMPLEMENTATIONS =====
+# Instantiated once per session; the fixtures below reset their state after each test.
+
+def _namespace(key: str) -> str:
+    return key.split(":", 1)[0]
+
+
+class InMemoryCache:
+    """In-memory cache implementation for testing"""
+    __slots__ = ("data", "operations", "by_prefix")
+
+    def __init__(self):
+        self.data = {}
+        self.operations = []
+        # Keys grouped by namespace (text before the first ":") for invalidate_pattern
+        self.by_prefix = defaultdict(set)
+
+    def reset(self):
+        self.data.clear()
+        self.operations.clear()
+        self.by_prefix.clear()
+
+    async def get(self, key: str):
+        self.operations.append(("get", key))
+        return self.data.get(key)
+
+    async def set(self, key: str, value, ttl_seconds: int = 3600):
+        self.operations.append(("set", key))
+        self.data[key] = value
+        self.by_prefix[_namespace(key)].add(key)
+
+    async def delete(self, key: str):
+        self.operations.append(("delete", key))
+        self.data.pop(key, None)
+        self.by_prefix[_namespace(key)].discard(key)
+
+    async def exists(self, key: str):
+        return key in self.data
+
+    async def invalidate_pattern(self, pattern: str):
+        needle = pattern.replace("*", "")
+        if pattern.startswith("*"):
+            matched = [key for key in self.data if needle in key]
+        else:
+            # Like Redis, "ns:foo*" only matches keys starting with "ns:foo"
+            bucket = self.by_prefix.get(_namespace(needle), ())
+            matched = [key for key in bucket if key.startswith(needle)]
+        for key in matched:
+            del self.data[key]
+            self.by_prefix[_namespace(key)].discard(key)
+        return len(matched)
+
+
+class InMemoryBroker:
+    """In-memory message broker for testing"""
+    __slots__ = ("messages", "subscriptions", "_seq")
+
+    def __init__(self):
+        self.messages = []
+        self.subscriptions = defaultdict(list)
+        # Publish order; cheaper than timestamping every message
+        self._seq = 0
+
+    def reset(self):
+        self.messages.clear()
+        self.subscriptions.clear()
+        self._seq = 0
+
+    async def publish(self, message, topic: str = None):
+        self._seq += 1
+        self.messages.append({"message": message, "topic": topic, "seq": self._seq})
+        return f"delivery-{self._seq}"
+
+    async def subscribe(self, topic: str, callback):
+        self.subscriptions[topic].append(callback)
+        return f"sub-{len(self.subscriptions)}"
+
+    async def health_check(self):
+        return True
+
+    def get_messages(self, topic: str = None):
+        if topic:
+            return [m for m in self.messages if m.get("topic") == topic]
+        return self.messages
+
+
+class InMemoryEventStore:
+    """In-memory event store for testing"""
+    __slots__ = ("events",)
+
+    def __init__(self):
+        self.events = defaultdict(list)
+
+    def reset(self):
+        self.events.clear()
+
+    async def append_events(self, aggregate_id: str, events):
+        self.events[aggregate_id].extend(events)
+
+    async def get_events(self, aggregate_id: str, from_version: int = 0):
+        return self.events.get(aggregate_id, [])[from_version:]
+
+    async def health_check(self):
+        return True
+
+
+class InMemoryAuditStore:
+    """In-memory audit store for testing"""
+    __slots__ = ("entries", "by_id", "by_request", "by_tenant", "by_actor", "by_resource")
+
+    def __init__(self):
+        self.entries = []
+        # Secondary indexes so lookups don't scan every entry
+        self.by_id = {}
+        self.by_request = {}
+        self.by_tenant = {}
+        self.by_actor = {}
+        self.by_resource = {}
+
+    def reset(self):
+        self.entries.clear()
+        self.by_id.clear()
+        self.by_request.clear()
+        self.by_tenant.clear()
+        self.by_actor.clear()
+        self.by_resource.clear()
+
+    async def append(self, entry):
+        entry_id = f"entry-{len(self.entries)}"
+        from dataclasses import replace
+        entry_with_id = replace(entry, entry_id=entry_id)
+        self.entries.append(entry_with_id)
+        self.by_id[entry_id] = entry_with_id
+        self.by_request.setdefault(entry_with_id.request_id, []).append(entry_with_id)
+        self.by_tenant.setdefault(entry_with_id.tenant_id, []).append(entry_with_id)
+        self.by_actor.setdefault(
+            (entry_with_id.tenant_id, entry_with_id.actor_id), []
+        ).append(entry_with_id)
+        self.by_resource.setdefault(
+            (entry_with_id.tenant_id, entry_with_id.resource_id), []
+        ).append(entry_with_id)
+        return entry_id
+
+    async def query(self, query):
+        actor_id = query.actor_id
+        action = query.action
+        if query.tenant_id and actor_id:
+            results = self.by_actor.get((query.tenant_id, actor_id), [])
+            actor_id = None
+        elif query.tenant_id:
+            results = self.by_tenant.get(query.tenant_id, [])
+        else:
+            results = self.entries
+        if actor_id or action:
+            # Remaining filters applied in a single pass
+            results = [
+                e for e in results
+                if (not actor_id or e.actor_id == actor_id)
+                and (not action or e.action.value == action)
+            ]
+        return results[query.offset:query.offset + query.limit]
+
+    async def get_by_id(self, entry_id: str):
+        return self.by_id.get(entry_id)
+
+    async def get_by_request_id(self, request_id: str):
+        return list(self.by_request.get(request_id, ()))
+
+    async def get_actor_history(self, tenant_id: str, actor_id: str, limit: int = 100):
+        return self.by_actor.get((tenant_id, actor_id), [])[:limit]
+
+    async def get_resource_history(self, tenant_id: str, resource_id: str, limit: int = 100):
+        return self.by_resource.get((tenant_id, resource_id), [])[:limit]
+
+    async def export_range(self, tenant_id: str, start_date, end_date):
+        return orjson.dumps([e.to_dict() for e in self.by_tenant.get(tenant_id, [])])
+
+    async def verify_integrity(self):
+        return True
+
+
+# ===== MOCK TEMPLATES =====
+# AsyncMock hierarchies are costly to build, so each one is configured once per
+# session and tests receive a shallow copy with call tracking reset. Only methods
+# whose result callers read are configured; the rest are created lazily on access.
+
+def _fresh(template):
+    """Copy a session mock template and clear its recorded calls"""
+    mock = copy.copy(template)
+    mock.reset_mock(side_effect=True)
+    return mock
+
+
 # ===== DATABASE FIXTURES =====
 
-@pytest.fixture
-async def mock_db():
-    """Mock database connection"""
+@pytest.fixture(scope="session")
+def _mock_db_template():
     db = AsyncMock()
-    db.execute = AsyncMock(return_value=True)
-    db.query = AsyncMock(return_value=[])
+    db.execute.return_value = True
+    db.query.return_value = []
     db.pool_size = 20
-    db.health_check = AsyncMock(return_value=True)
+    db.health_check.return_value = True
     return db
 
 
 @pytest.fixture
-async def mock_postgres():
-    """Mock PostgreSQL adapter"""
+def mock_db(_mock_db_template):
+    """Mock database connection"""
+    return _fresh(_mock_db_template)
+
+
+@pytest.fixture(scope="session")
+def _mock_postgres_template():
     adapter = AsyncMock()
-    adapter.connect = AsyncMock(return_value=None)
-    adapter.disconnect = AsyncMock(return_value=None)
-    adapter.execute = AsyncMock(return_value=None)
-    adapter.query = AsyncMock(return_value=[])
+    adapter.query.return_value = []
     return adapter
 
 
+@pytest.fixture
+def mock_postgres(_mock_postgres_template):
+    """Mock PostgreSQL adapter"""
+    return _fresh(_mock_postgres_template)
+
+
 # ===== CACHE FIXTURES =====
 
-@pytest.fixture
-async def mock_cache():
-    """Mock cache (Redis)"""
+@pytest.fixture(scope="session")
+def _mock_cache_template():
     cache = AsyncMock()
-    cache.get = AsyncMock(return_value=None)
-    cache.set = AsyncMock(return_value=None)
-    cache.delete = AsyncMock(return_value=None)
-    cache.exists = AsyncMock(return_value=False)
-    cache.invalidate_pattern = AsyncMock(return_value=0)
+    cache.get.return_value = None
+    cache.exists.return_value = False
+    cache.invalidate_pattern.return_value = 0
     return cache
 
 
 @pytest.fixture
-async def in_memory_cache():
-    """In-memory cache implementation for testing"""
-    class InMemoryCache:
-        def __init__(self):
-            self.data = {}
-            self.operations = []
-
-        async def get(self, key: str):
-            self.operations.append(("get", key))
-            return self.data.get(key)
-
-        async def set(self, key: str, value, ttl_seconds: int = 3600):
-            self.operations.append(("set", key))
-            self.data[key] = value
-
-        async def delete(self, key: str):
-            self.operations.append(("delete", key))
-            self.data.pop(key, None)
-
-        async def exists(self, key: str):
-            return key in self.data
-
-        async def invalidate_pattern(self, pattern: str):
-            count = 0
-            keys_to_delete = []
-            for key in self.data.keys():
-                if pattern.replace("*", "") in key:
-                    keys_to_delete.append(key)
-                    count += 1
-            for key in keys_to_delete:
-                del self.data[key]
-            return count
+def mock_cache(_mock_cache_template):
+    """Mock cache (Redis)"""
+    return _fresh(_mock_cache_template)
+
 
+@pytest.fixture(scope="session")
+def _in_memory_cache_instance():
     return InMemoryCache()
 
 
+@pytest.fixture
+def in_memory_cache(_in_memory_cache_instance):
+    """In-memory cache implementation for testing"""
+    yield _in_memory_cache_instance
+    _in_memory_cache_instance.reset()
+
+
 # ===== MESSAGE BROKER FIXTURES =====
 
-@pytest.fixture
-async def mock_message_broker():
-    """Mock message broker"""
+@pytest.fixture(scope="session")
+def _mock_message_broker_template():
     broker = AsyncMock()
-    broker.publish = AsyncMock(return_value="delivery-id-123")
-    broker.subscribe = AsyncMock(return_value="subscription-id-456")
-    broker.unsubscribe = AsyncMock(return_value=None)
-    broker.health_check = AsyncMock(return_value=True)
+    broker.publish.return_value = "delivery-id-123"
+    broker.subscribe.return_value = "subscription-id-456"
+    broker.health_check.return_value = True
     return broker
 
 
 @pytest.fixture
-async def in_memory_message_broker():
-    """In-memory message broker for testing"""
-    class InMemoryBroker:
-        def __init__(self):
-            self.messages = []
-            self.subscriptions = {}
-
-        async def publish(self, message, topic: str = None):
-            self.messages.append({"message": message, "topic": topic, "published_at": datetime.utcnow()})
-            return f"delivery-{len(self.messages)}"
+def mock_message_broker(_mock_message_broker_template):
+    """Mock message broker"""
+    return _fresh(_mock_message_broker_template)
 
-        async def subscribe(self, topic: str, callback):
-            if topic not in self.subscriptions:
-                self.subscriptions[topic] = []
-            self.subscriptions[topic].append(callback)
-            return f"sub-{len(self.subscriptions)}"
 
-        async def health_check(self):
-            return True
+@pytest.fixture(scope="session")
+def _in_memory_message_broker_instance():
+    return InMemoryBroker()
 
-        def get_messages(self, topic: str = None):
-            if topic:
-                return [m for m in self.messages if m.get("topic") == topic]
-            return self.messages
 
-    return InMemoryBroker()
+@pytest.fixture
+def in_memory_message_broker(_in_memory_message_broker_instance):
+    """In-memory message broker for testing"""
+    yield _in_memory_message_broker_instance
+    _in_memory_message_broker_instance.reset()
 
 
 # ===== EVENT STORE FIXTURES =====
 
-@pytest.fixture
-async def mock_event_store():
-    """Mock event store"""
+@pytest.fixture(scope="session")
+def _mock_event_store_template():
     store = AsyncMock()
-    store.append_events = AsyncMock(return_value=None)
-    store.get_events = AsyncMock(return_value=[])
-    store.health_check = AsyncMock(return_value=True)
+    store.get_events.return_value = []
+    store.health_check.return_value = True
     return store
 
 
 @pytest.fixture
-async def in_memory_event_store():
-    """In-memory event store for testing"""
-    class InMemoryEventStore:
-        def __init__(self):
-            self.events = {}
+def mock_event_store(_mock_event_store_template):
+    """Mock event store"""
+    return _fresh(_mock_event_store_template)
 
-        async def append_events(self, aggregate_id: str, events):
-            if aggregate_id not in self.events:
-                self.events[aggregate_id] = []
-            self.events[aggregate_id].extend(events)
 
-        async def get_events(self, aggregate_id: str, from_version: int = 0):
-            return self.events.get(aggregate_id, [])[from_version:]
+@pytest.fixture(scope="session")
+def _in_memory_event_store_instance():
+    return InMemoryEventStore()
 
-        async def health_check(self):
-            return True
 
-    return InMemoryEventStore()
+@pytest.fixture
+def in_memory_event_store(_in_memory_event_store_instance):
+    """In-memory event store for testing"""
+    yield _in_memory_event_store_instance
+    _in_memory_event_store_instance.reset()
 
 
 # ===== AUDIT STORE FIXTURES =====
 
+@pytest.fixture(scope="session")
+def _in_memory_audit_store_instance():
+    return InMemoryAuditStore()
+
+
 @pytest.fixture
-async def in_memory_audit_store():
+def in_memory_audit_store(_in_memory_audit_store_instance):
     """In-memory audit store for testing"""
-    class InMemoryAuditStore:
-        def __init__(self):
-            self.entries = []
-
-        async def append(self, entry):
-            entry_id = f"entry-{len(self.entries)}"
-            from dataclasses import replace
-            entry_with_id = replace(entry, entry_id=entry_id)
-            self.entries.append(entry_with_id)
-            return entry_id
-
-        async def query(self, query):
-            results = self.entries
-            if query.tenant_id:
-                results = [e for e in results if e.tenant_id == query.tenant_id]
-            if query.actor_id:
-                results = [e for e in results if e.actor_id == query.actor_id]
-            if query.action:
-                results = [e for e in results if e.action.value == query.action]
-            return results[query.offset:query.offset + query.limit]
-
-        async def get_by_id(self, entry_id: str):
-            for entry in self.entries:
-                if entry.entry_id == entry_id:
-                    return entry
-            return None
-
-        async def get_by_request_id(self, request_id: str):
-            return [e for e in self.entries if e.request_id == request_id]
-
-        async def get_actor_history(self, tenant_id: str, actor_id: str, limit: int = 100):
-            return [
-                e for e in self.entries
-                if e.tenant_id == tenant_id and e.actor_id == actor_id
-            ][:limit]
-
-        async def get_resource_history(self, tenant_id: str, resource_id: str, limit: int = 100):
-            return [
-                e for e in self.entries
-                if e.tenant_id == tenant_id and e.resource_id == resource_id
-            ][:limit]
-
-        async def export_range(self, tenant_id: str, start_date, end_date):
-            import json
-            entries = [e for e in self.entries if e.tenant_id == tenant_id]
-            return json.dumps([e.to_dict() for e in entries]).encode()
-
-        async def verify_integrity(self):
-            return True
-
-    return InMemoryAuditStore()
+    yield _in_memory_audit_store_instance
+    _in_memory_audit_store_instance.reset()
 
 
 # ===== COMBINED FIXTURES =====
 
+class LazyFixtures(Mapping):
+    """Mapping of dependency name to fixture, resolved on first access"""
+
+    def __init__(self, request, fixture_names: Dict[str, str]):
+        self._request = request
+        self._fixture_names = fixture_names
+        self._values = {}
+
+    def __getitem__(self, key):
+        if key not in self._values:
+            self._values[key] = self._request.getfixturevalue(self._fixture_names[key])
+        return self._values[key]
+
+    def __iter__(self):
+        return iter(self._fixture_names)
+
+    def __len__(self):
+        return len(self._fixture_names)
+
+
 @pytest.fixture
-async def mock_dependencies(mock_db, mock_cache, mock_message_broker, mock_event_store):
+def mock_dependencies(request):
     """All mock dependencies together"""
-    return {
-        'db': mock_db,
-        'cache': mock_cache,
-        'message_broker': mock_message_broker,
-        'event_store': mock_event_store
-    }
+    return LazyFixtures(request, {
+        'db': 'mock_db',
+        'cache': 'mock_cache',
+        'message_broker': 'mock_message_broker',
+        'event_store': 'mock_event_store'
+    })
 
 
 @pytest.fixture
-async def in_memory_dependencies(in_memory_cache, in_memory_message_broker,
-                                 in_memory_event_store, in_memory_audit_store):
+def in_memory_dependencies(request):
     """All in-memory implementations together"""
-    return {
-        'cache': in_memory_cache,
-        'message_broker': in_memory_message_broker,
-        'event_store': in_memory_event_store,
-        'audit_store': in_memory_audit_store
-    }
+    return LazyFixtures(request, {
+        'cache': 'in_memory_cache',
+        'message_broker': 'in_memory_message_broker',
+        'event_store': 'in_memory_event_store',
+        'audit_store': 'in_memory_audit_store'
+    })
 
 
 # ===== TEST UTILITIES =====
@@ -322,6 +453,16 @@ def assert_audit_logged():
     return _assert
 
 
+# ===== PYTEST CONFIGURATION =====
+
+def pytest_collection_modifyitems(items):
+    """Run every async test on the session event loop shared with fixtures"""
+    session_loop = pytest.mark.asyncio(loop_scope="session")
+    for item in items:
+        if is_async_test(item):
+            item.add_marker(session_loop, append=False)
+
+
 # ===== PYTEST MARKS =====
 
 def pytest_configure(config):
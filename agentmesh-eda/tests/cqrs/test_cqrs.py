@@ -5,8 +5,12 @@ from agentmesh.cqrs.event_store import InMemoryEventStore
 from agentmesh.cqrs.bus import CqrsBus
 from dataclasses import dataclass
 from datetime import datetime
+import itertools
+import sys
 import uuid
 
+import pytest
+
 
 # 1. Define Commands
 @dataclass
@@ -74,6 +78,24 @@ class BankAccount:
             self._apply(event)
 
 
+# Event ids and timestamps are irrelevant to these assertions; stubbing them
+# avoids a urandom read and a clock call per event in bulk-event tests.
+_FIXED_DT = datetime(2024, 1, 1)
+
+
+class _FixedDatetime(datetime):
+    @classmethod
+    def utcnow(cls):
+        return _FIXED_DT
+
+
+@pytest.fixture
+def fast_event_ids(monkeypatch):
+    counter = itertools.count(1)
+    monkeypatch.setattr(uuid, "uuid4", lambda: uuid.UUID(int=next(counter)))
+    monkeypatch.setattr(sys.modules[__name__], "datetime", _FixedDatetime)
+
+
 # 4. Define Command Handler
 class BankAccountCommandHandler(CommandHandler):
     def __init__(self, event_store: InMemoryEventStore):
@@ -121,6 +143,7 @@ class BankAccountEventHandler(EventHandler):
             self.read_model.accounts[tenant_id][event.account_id] += event.amount
 
 
+@pytest.mark.usefixtures("fast_event_ids")
 def test_cqrs_flow():
     # Setup
     event_store = InMemoryEventStore()
@@ -0,0 +1,10 @@
+import pytest
+from loguru import logger
+
+
+@pytest.fixture(autouse=True)
+def logged_info(monkeypatch):
+    """Messages passed to logger.info during the test"""
+    calls = []
+    monkeypatch.setattr(logger, "info", calls.append)
+    return calls
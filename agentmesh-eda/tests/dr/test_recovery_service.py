@@ -1,31 +1,24 @@
 from agentmesh.dr.recovery_service import RecoveryService
-from unittest.mock import patch
-from loguru import logger
 
 
-def test_recovery_service_init():
-    with patch.object(logger, "info") as mock_info:
-        RecoveryService()
-        mock_info.assert_called_once_with("RecoveryService initialized.")
+def test_recovery_service_init(logged_info):
+    RecoveryService()
+    assert logged_info == ["RecoveryService initialized."]
 
 
-def test_recovery_service_restore_from_backup():
+def test_recovery_service_restore_from_backup(logged_info):
     service = RecoveryService()
     backup_id = "backup_123"
-    with patch.object(logger, "info") as mock_info:
-        result = service.restore_from_backup(backup_id)
-        assert result # Changed to truthy check
-        mock_info.assert_called_once_with(
-            f"Restoring from backup: {backup_id} (Placeholder)"
-        )
+    logged_info.clear()
+    result = service.restore_from_backup(backup_id)
+    assert result # Changed to truthy check
+    assert logged_info == [f"Restoring from backup: {backup_id} (Placeholder)"]
 
 
-def test_recovery_service_get_recovery_status():
+def test_recovery_service_get_recovery_status(logged_info):
     service = RecoveryService()
     recovery_id = "recovery_456"
-    with patch.object(logger, "info") as mock_info:
-        status = service.get_recovery_status(recovery_id)
-        assert status == {"status": "completed", "progress": 100}
-        mock_info.assert_called_once_with(
-            f"Getting recovery status for: {recovery_id} (Placeholder)"
-        )
+    logged_info.clear()
+    status = service.get_recovery_status(recovery_id)
+    assert status == {"status": "completed", "progress": 100}
+    assert logged_info == [f"Getting recovery status for: {recovery_id} (Placeholder)"]
@@ -12,6 +12,7 @@ Architectural Intent:
 
 import pytest
 import asyncio
+import sys
 from datetime import datetime
 
 from agentmesh.domain.entities.agent_aggregate import AgentAggregate
@@ -45,17 +46,27 @@ class MockEventBus:
         self.events.append(event)
 
 
-def create_test_agent(agent_id: str,
-                     capabilities: list) -> AgentAggregate:
-    """Helper to create test agent"""
-    caps = [AgentCapability(name=cap["name"], proficiency_level=cap.get("level", 3))
-            for cap in capabilities]
-    return AgentAggregate(
-        agent_id=AgentId(agent_id),
-        tenant_id="test-tenant",
-        name=f"Test Agent {agent_id}",
-        capabilities=caps
-    )
+@pytest.fixture(scope="session")
+def agent_factory():
+    """Factory for test agents; capability value objects are built once and shared"""
+    cap_pool = {}
+
+    def create_test_agent(agent_id: str,
+                          capabilities: list) -> AgentAggregate:
+        caps = []
+        for cap in capabilities:
+            key = (cap["name"], cap.get("level", 3))
+            if key not in cap_pool:
+                cap_pool[key] = AgentCapability(name=sys.intern(key[0]), proficiency_level=key[1])
+            caps.append(cap_pool[key])
+        return AgentAggregate(
+            agent_id=AgentId(agent_id),
+            tenant_id="test-tenant",
+            name=f"Test Agent {agent_id}",
+            capabilities=caps
+        )
+
+    return create_test_agent
 
 
 def create_test_task(task_id: str,
@@ -64,7 +75,7 @@ def create_test_task(task_id: str,
     """Helper to create test task"""
     return TaskOffering(
         task_id=task_id,
-        required_capabilities=required_capabilities,
+        required_capabilities=[sys.intern(name) for name in required_capabilities],
         priority=priority,
         estimated_duration_seconds=60,
         estimated_resource_load=0.3
@@ -75,24 +86,27 @@ def create_test_task(task_id: str,
 class TestAgentWorkflows:
     """End-to-end agent workflow tests"""
 
+    @pytest.fixture(scope="class")
+    def services(self):
+        """Stateless domain services, shared by the whole class"""
+        return {
+            "autonomy": AgentAutonomyService(),
+            "load_balancer": AgentLoadBalancerService()
+        }
+
     @pytest.fixture
-    def setup(self):
+    def setup(self, services):
         """Setup test environment"""
-        repo = MockAgentRepository()
-        event_bus = MockEventBus()
-        autonomy_service = AgentAutonomyService()
-        load_balancer = AgentLoadBalancerService()
         return {
-            "repo": repo,
-            "event_bus": event_bus,
-            "autonomy": autonomy_service,
-            "load_balancer": load_balancer
+            "repo": MockAgentRepository(),
+            "event_bus": MockEventBus(),
+            **services
         }
 
-    async def test_agent_accepts_suitable_task(self, setup):
+    async def test_agent_accepts_suitable_task(self, setup, agent_factory):
         """Workflow: Agent receives task and accepts it"""
         # Setup
-        agent_agg = create_test_agent(
+        agent_agg = agent_factory(
             "agent-1",
             [{"name": "data_processing", "level": 4}]
         )
@@ -117,10 +131,10 @@ class TestAgentWorkflows:
         assert accepted[0] == "task-1"
         assert len(agent.task_queue) == 1
 
-    async def test_agent_rejects_unsuitable_task(self, setup):
+    async def test_agent_rejects_unsuitable_task(self, setup, agent_factory):
         """Workflow: Agent receives task and rejects it"""
         # Setup
-        agent_agg = create_test_agent(
+        agent_agg = agent_factory(
             "agent-2",
             [{"name": "data_processing", "level": 2}]  # Low proficiency
         )
@@ -144,10 +158,10 @@ class TestAgentWorkflows:
         assert len(accepted) == 0
         assert len(agent.task_queue) == 0
 
-    async def test_agent_prioritizes_task_queue(self, setup):
+    async def test_agent_prioritizes_task_queue(self, setup, agent_factory):
         """Workflow: Agent prioritizes multiple accepted tasks"""
         # Setup
-        agent_agg = create_test_agent(
+        agent_agg = agent_factory(
             "agent-3",
             [
                 {"name": "data_processing", "level": 4},
@@ -176,10 +190,10 @@ class TestAgentWorkflows:
         assert len(accepted) >= 2
         assert agent.task_queue[0].task_id == "task-b"  # Highest priority first
 
-    async def test_agent_executes_task_queue(self, setup):
+    async def test_agent_executes_task_queue(self, setup, agent_factory):
         """Workflow: Agent executes tasks sequentially"""
         # Setup
-        agent_agg = create_test_agent(
+        agent_agg = agent_factory(
             "agent-4",
             [{"name": "simple_task", "level": 5}]  # High proficiency = high success rate
         )
@@ -203,10 +217,10 @@ class TestAgentWorkflows:
         assert len(results) >= 1
         assert agent.task_queue == []  # Queue empty
 
-    async def test_agent_handles_task_failure(self, setup):
+    async def test_agent_handles_task_failure(self, setup, agent_factory):
         """Workflow: Agent handles failed task gracefully"""
         # Setup with low success rate to force failures
-        agent_agg = create_test_agent(
+        agent_agg = agent_factory(
             "agent-5",
             [{"name": "risky_task", "level": 3}]
         )
@@ -228,14 +242,14 @@ class TestAgentWorkflows:
         # Verify - should handle success or failure gracefully
         assert len(results) >= 1
 
-    async def test_multiple_agents_collaborate(self, setup):
+    async def test_multiple_agents_collaborate(self, setup, agent_factory):
         """Workflow: Multiple agents work on different tasks"""
         # Setup agents
-        agent1_agg = create_test_agent(
+        agent1_agg = agent_factory(
             "agent-a",
             [{"name": "data_processing", "level": 5}]
         )
-        agent2_agg = create_test_agent(
+        agent2_agg = agent_factory(
             "agent-b",
             [{"name": "analysis", "level": 5}]
         )
@@ -269,10 +283,10 @@ class TestAgentWorkflows:
         assert accepted1[0] == "task-1"
         assert accepted2[0] == "task-2"
 
-    async def test_agent_health_check(self, setup):
+    async def test_agent_health_check(self, setup, agent_factory):
         """Workflow: Agent performs health check"""
         # Setup
-        agent_agg = create_test_agent(
+        agent_agg = agent_factory(
             "agent-health",
             [{"name": "test", "level": 3}]
         )
@@ -291,10 +305,10 @@ class TestAgentWorkflows:
         assert isinstance(is_healthy, bool)
         assert agent.aggregate.current_metrics is not None
 
-    async def test_agent_workload_management(self, setup):
+    async def test_agent_workload_management(self, setup, agent_factory):
         """Workflow: Agent manages own workload"""
         # Setup
-        agent_agg = create_test_agent(
+        agent_agg = agent_factory(
             "agent-load",
             [{"name": "task", "level": 4}]
         )
@@ -318,10 +332,10 @@ class TestAgentWorkflows:
         workload = agent.get_workload()
         assert 0.0 <= workload <= 1.0
 
-    async def test_agent_pause_and_resume(self, setup):
+    async def test_agent_pause_and_resume(self, setup, agent_factory):
         """Workflow: Agent can be paused and resumed"""
         # Setup
-        agent_agg = create_test_agent(
+        agent_agg = agent_factory(
             "agent-pause",
             [{"name": "task", "level": 3}]
         )
@@ -344,10 +358,10 @@ class TestAgentWorkflows:
         await agent.resume()
         assert agent.aggregate.status == "AVAILABLE"
 
-    async def test_agent_status_summary(self, setup):
+    async def test_agent_status_summary(self, setup, agent_factory):
         """Workflow: Get agent status summary"""
         # Setup
-        agent_agg = create_test_agent(
+        agent_agg = agent_factory(
             "agent-status",
             [{"name": "task", "level": 3}]
         )
@@ -25,7 +25,7 @@ class TestCircuitBreakerStates:
         breaker = CircuitBreaker("test")
         assert breaker.state == CircuitState.CLOSED
 
-    def test_transitions_to_open_after_failures(self):
+    async def test_transitions_to_open_after_failures(self):
         """Circuit should open after failure threshold exceeded"""
         breaker = CircuitBreaker(
             "test",
@@ -39,11 +39,11 @@ class TestCircuitBreakerStates:
         # Cause failures
         for i in range(3):
             with pytest.raises(ValueError):
-                asyncio.run(breaker.call(failing_func))
+                await breaker.call(failing_func)
 
         assert breaker.state == CircuitState.OPEN
 
-    def test_rejects_calls_when_open(self):
+    async def test_rejects_calls_when_open(self):
         """Circuit should reject calls when OPEN"""
         breaker = CircuitBreaker("test", failure_threshold=1)
 
@@ -52,16 +52,16 @@ class TestCircuitBreakerStates:
 
         # Cause one failure to open circuit
         with pytest.raises(ValueError):
-            asyncio.run(breaker.call(failing_func))
+            await breaker.call(failing_func)
 
         # Circuit should now be open
         assert breaker.state == CircuitState.OPEN
 
         # Next call should be rejected immediately
         with pytest.raises(CircuitBreakerOpenException):
-            asyncio.run(breaker.call(failing_func))
+            await breaker.call(failing_func)
 
-    def test_half_open_after_timeout(self):
+    async def test_half_open_after_timeout(self):
         """Circuit should transition to HALF_OPEN after recovery timeout"""
         breaker = CircuitBreaker(
             "test",
@@ -74,22 +74,22 @@ class TestCircuitBreakerStates:
 
         # Cause failure
         with pytest.raises(ValueError):
-            asyncio.run(breaker.call(failing_func))
+            await breaker.call(failing_func)
 
         assert breaker.state == CircuitState.OPEN
 
         # Wait for recovery timeout
-        asyncio.run(asyncio.sleep(1.1))
+        await asyncio.sleep(1.1)
 
         # Try calling again - should transition to HALF_OPEN
         async def succeeding_func():
             return "success"
 
-        result = asyncio.run(breaker.call(succeeding_func))
+        result = await breaker.call(succeeding_func)
         assert result == "success"
         assert breaker.state == CircuitState.HALF_OPEN
 
-    def test_closes_after_success_in_half_open(self):
+    async def test_closes_after_success_in_half_open(self):
         """Circuit should close after successful calls in HALF_OPEN"""
         breaker = CircuitBreaker(
             "test",
@@ -106,14 +106,14 @@ class TestCircuitBreakerStates:
 
         # Open circuit
         with pytest.raises(ValueError):
-            asyncio.run(breaker.call(failing_func))
+            await breaker.call(failing_func)
 
         # Artificially set to HALF_OPEN
         breaker._transition_to(CircuitState.HALF_OPEN)
 
         # Two successes should close circuit
         for _ in range(2):
-            asyncio.run(breaker.call(succeeding_func))
+            await breaker.call(succeeding_func)
 
         assert breaker.state == CircuitState.CLOSED
 
@@ -121,7 +121,7 @@ class TestCircuitBreakerStates:
 class TestCircuitBreakerFailureHandling:
     """Test failure detection and handling"""
 
-    def test_resets_failure_count_on_success(self):
+    async def test_resets_failure_count_on_success(self):
         """Failure count should reset on successful call"""
         breaker = CircuitBreaker("test", failure_threshold=3)
 
@@ -134,15 +134,15 @@ class TestCircuitBreakerFailureHandling:
         # Cause 2 failures
         for _ in range(2):
             with pytest.raises(ValueError):
-                asyncio.run(breaker.call(failing_func))
+                await breaker.call(failing_func)
 
         assert breaker.failure_count == 2
 
         # Success should reset counter
-        asyncio.run(breaker.call(succeeding_func))
+        await breaker.call(succeeding_func)
         assert breaker.failure_count == 0
 
-    def test_only_counts_expected_exceptions(self):
+    async def test_only_counts_expected_exceptions(self):
         """Should only count configured exception types"""
         breaker = CircuitBreaker(
             "test",
@@ -155,11 +155,11 @@ class TestCircuitBreakerFailureHandling:
 
         # TypeError should not be counted
         with pytest.raises(TypeError):
-            asyncio.run(breaker.call(raises_type_error))
+            await breaker.call(raises_type_error)
 
         assert breaker.failure_count == 0
 
-    def test_counts_expected_exceptions(self):
+    async def test_counts_expected_exceptions(self):
         """Should count expected exception types"""
         breaker = CircuitBreaker(
             "test",
@@ -172,7 +172,7 @@ class TestCircuitBreakerFailureHandling:
 
         # ValueError should be counted
         with pytest.raises(ValueError):
-            asyncio.run(breaker.call(raises_value_error))
+            await breaker.call(raises_value_error)
 
         assert breaker.failure_count == 1
 
@@ -190,7 +190,7 @@ class TestCircuitBreakerMetrics:
         assert metrics["failure_count"] == 0
         assert "failure_threshold" in metrics
 
-    def test_metrics_after_failures(self):
+    async def test_metrics_after_failures(self):
         """Metrics should reflect failure state"""
         breaker = CircuitBreaker("test", failure_threshold=5)
 
@@ -200,7 +200,7 @@ class TestCircuitBreakerMetrics:
         # Cause 3 failures
         for _ in range(3):
             with pytest.raises(ValueError):
-                asyncio.run(breaker.call(failing_func))
+                await breaker.call(failing_func)
 
         metrics = breaker.get_metrics()
         assert metrics["failure_count"] == 3
@@ -244,7 +244,7 @@ class TestCircuitBreakerManager:
         assert all_metrics["api_1"]["name"] == "api_1"
         assert all_metrics["api_2"]["name"] == "api_2"
 
-    def test_get_open_circuits(self):
+    async def test_get_open_circuits(self):
         """Should identify open circuits"""
         from agentmesh.infrastructure.resilience.circuit_breaker import CircuitBreakerManager
 
@@ -261,7 +261,7 @@ class TestCircuitBreakerManager:
             raise ValueError("Test error")
 
         with pytest.raises(ValueError):
-            asyncio.run(breaker1.call(failing_func))
+            await breaker1.call(failing_func)
 
         open_circuits = manager.get_open_circuits()
         assert "api_1" in open_circuits